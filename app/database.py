@@ -1,39 +1,90 @@
-from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # SQLite database file
 # Ganti ke ":memory:" kalau mau in-memory database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./monitoring.db"
+# Driver aiosqlite biar query DB ga nge-block event loop
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./monitoring.db"
 
-# create_engine adalah factory untuk bikin koneksi database
+# create_async_engine adalah factory untuk bikin koneksi database (async)
 # check_same_thread=False khusus untuk SQLite agar bisa dipake di multi-thread
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+# AsyncAdaptedQueuePool: koneksi sqlite3 dipake ulang antar request, jadi file
+# db/-wal/-shm ga dibuka-tutup terus dan page cache per koneksi tetap "hangat"
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_recycle=3600
 )
 
-# SessionLocal adalah class untuk bikin database session
-# autocommit=False: kita manual commit transaction
+
+# Event listener di-pasang ke sync_engine (AsyncEngine ga punya event sendiri)
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Set PRAGMA SQLite setiap kali koneksi fisik baru dibuka.
+    Karena koneksi di-pool, ini cuma jalan sekali per koneksi, bukan per checkout.
+
+    - journal_mode=WAL: reader ga ke-block sama writer (POST /monitor)
+    - synchronous=NORMAL: ga fsync tiap commit, aman di mode WAL
+    - temp_store=MEMORY: temporary table/index (ORDER BY, GROUP BY) di RAM
+    - cache_size=-64000: page cache ~64MB per koneksi
+    - mmap_size=256MB: baca file database via memory-mapped I/O
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+# Interval jalanin PRAGMA optimize (detik)
+OPTIMIZE_INTERVAL_SECONDS = 3600
+
+
+async def optimize_database():
+    """
+    Jalanin PRAGMA optimize biar statistik query planner SQLite tetap update.
+
+    Data monitoring makin lama makin miring (hampir semua healthy, beberapa
+    URL jauh lebih sering dicek), jadi tanpa statistik yang update planner
+    bisa salah pilih index. PRAGMA optimize cuma ANALYZE kalau memang perlu,
+    jadi murah kalau dijalanin rutin.
+    """
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA optimize")
+
+
+# SessionLocal adalah class untuk bikin database session (async)
 # autoflush=False: data ga auto flush ke DB sebelum commit
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: object tetap bisa dibaca setelah commit
+# (di async, lazy reload setelah commit ga bisa jalan di luar await)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class untuk semua model SQLAlchemy
 Base = declarative_base()
 
 
 # Dependency untuk dapetin database session
-def get_db():
+async def get_db():
     """
-    Generator function yang yield database session.
+    Async generator yang yield database session.
     Setelah request selesai, session otomatis di-close.
-    
+
     Ini pattern yang bagus karena:
     1. Session selalu di-close, ga ada memory leak
     2. Setiap request dapet session baru (isolated)
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,30 @@
+import httpx
+from fastapi import Request
+
+# Timeout 10 detik biar ga nunggu kelamaan
+HTTP_TIMEOUT_SECONDS = 10.0
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Bikin 1 httpx.AsyncClient yang dipake bareng selama app jalan.
+    
+    Kenapa ga bikin client baru tiap request?
+    1. Connection pool dipake ulang (keep-alive), ga perlu TCP handshake lagi
+    2. TLS session bisa di-resume, ga full handshake tiap check
+    3. HTTP/2 bisa multiplexing banyak request di 1 koneksi
+    """
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT_SECONDS,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        follow_redirects=True
+    )
+
+
+# Dependency untuk dapetin shared HTTP client
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Ambil AsyncClient yang dibikin di lifespan (app.state.http).
+    """
+    return request.app.state.http
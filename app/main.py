@@ -1,12 +1,107 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import OPTIMIZE_INTERVAL_SECONDS, engine, Base, optimize_database
+from app.http_client import create_http_client
+from app.models.monitoring import FTS_DDL, MonitoringResult
 from app.routers import monitoring
 
 
-# Create database tables
-# Ini bikin semua tabel yang ada di models/
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+# Versi skema database (disimpan di PRAGMA user_version)
+# 1: created_at disimpan sebagai epoch milliseconds
+SCHEMA_VERSION = 1
+
+
+def create_tables(conn):
+    """
+    Create database tables + migrasi kecil untuk database lama.
+    """
+    # Ini bikin semua tabel yang ada di models/
+    Base.metadata.create_all(bind=conn)
+
+    # create_all ga nambahin index ke tabel yang udah ada,
+    # jadi index baru dibikin manual (CREATE INDEX IF NOT EXISTS)
+    for index in MonitoringResult.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+    # Index lama di url udah ke-cover sama ix_mr_url_created
+    conn.execute(text("DROP INDEX IF EXISTS ix_monitoring_results_url"))
+
+    # Database lama nyimpen created_at sebagai TEXT datetime (CURRENT_TIMESTAMP),
+    # convert ke epoch milliseconds biar bisa di-compare sama row baru.
+    # Tipe kolom di skema lama tetap DATETIME, jadi yang nandain migrasinya
+    # udah jalan itu PRAGMA user_version (biar UPDATE full scan cuma sekali)
+    if conn.exec_driver_sql("PRAGMA user_version").scalar() < SCHEMA_VERSION:
+        conn.execute(text(
+            "UPDATE monitoring_results "
+            "SET created_at = CAST(ROUND((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER) "
+            "WHERE typeof(created_at) = 'text'"
+        ))
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # Full-text index untuk /results/search
+    fts_exists = inspect(conn).has_table("monitoring_results_fts")
+    for ddl in FTS_DDL:
+        conn.execute(text(ddl))
+    if not fts_exists:
+        # Index FTS baru dibikin: isi dari data yang udah ada di tabel
+        conn.execute(text(
+            "INSERT INTO monitoring_results_fts(monitoring_results_fts) VALUES ('rebuild')"
+        ))
+
+
+async def optimize_periodically():
+    """
+    Background task: PRAGMA optimize tiap OPTIMIZE_INTERVAL_SECONDS.
+    """
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        try:
+            await optimize_database()
+        except SQLAlchemyError:
+            # Misalnya database lagi locked, coba lagi di interval berikutnya
+            logger.exception("PRAGMA optimize failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: bikin tabel, shared HTTP client & background task PRAGMA optimize.
+    Shutdown: tutup semua koneksi di pool HTTP & database.
+    """
+    # DDL masih API sync, jadi dijalanin lewat run_sync
+    async with engine.begin() as conn:
+        await conn.run_sync(create_tables)
+
+    app.state.http = create_http_client()
+    optimize_task = asyncio.create_task(optimize_periodically())
+    yield
+    try:
+        # Tunggu task-nya beneran berhenti, biar ga ada optimize yang masih
+        # megang koneksi waktu pool di-dispose
+        optimize_task.cancel()
+        try:
+            await optimize_task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Task-nya udah mati duluan karena error lain, jangan sampai
+            # bikin shutdown berhenti di tengah jalan
+            logger.exception("PRAGMA optimize task crashed")
+        await app.state.http.aclose()
+        try:
+            # SQLite nyaranin PRAGMA optimize sebelum koneksi ditutup
+            await optimize_database()
+        except SQLAlchemyError:
+            # Misalnya database lagi locked sama worker lain, skip aja
+            logger.exception("PRAGMA optimize failed")
+    finally:
+        await engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -14,7 +109,8 @@ app = FastAPI(
     description="Simple service monitoring API untuk cek uptime dan response time",
     version="1.0.0",
     docs_url="/docs",  # Swagger UI
-    redoc_url="/redoc"  # ReDoc
+    redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan
 )
 
 # CORS middleware (optional, kalau mau akses dari frontend)
@@ -1,6 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, Index, column, table
 from app.database import Base
+import time
+
+
+def now_ms() -> int:
+    """
+    Waktu sekarang dalam epoch milliseconds (UTC).
+    """
+    return time.time_ns() // 1_000_000
 
 
 class MonitoringResult(Base):
@@ -11,11 +18,20 @@ class MonitoringResult(Base):
     """
     __tablename__ = "monitoring_results"
 
+    # Composite index biar filter + ORDER BY created_at DESC bisa langsung
+    # scan index yang udah urut, ga perlu sort seluruh tabel tiap request
+    # ix_mr_url_created juga nge-cover query by url (ganti index lama di url)
+    __table_args__ = (
+        Index("ix_mr_healthy_created", "is_healthy", "created_at"),
+        Index("ix_mr_url_created", "url", "created_at"),
+        Index("ix_mr_created", "created_at"),
+    )
+
     # Primary key auto-increment
     id = Column(Integer, primary_key=True, index=True)
     
     # URL yang dimonitor
-    url = Column(String, nullable=False, index=True)
+    url = Column(String, nullable=False)
     
     # HTTP status code (200, 404, 500, etc)
     status_code = Column(Integer, nullable=True)
@@ -29,9 +45,52 @@ class MonitoringResult(Base):
     # Error message kalau ada masalah (timeout, connection error, etc)
     error_message = Column(String, nullable=True)
     
-    # Timestamp otomatis pake server time
-    # func.now() adalah fungsi SQL untuk current timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Timestamp dalam epoch milliseconds (UTC), diisi dari Python waktu insert
+    # Disimpen sebagai INTEGER (bukan TEXT datetime) biar compare/ORDER BY
+    # di index lebih murah dan row-nya lebih kecil
+    created_at = Column(BigInteger, nullable=False, default=now_ms)
 
     def __repr__(self):
-        return f"<MonitoringResult(id={self.id}, url={self.url}, status={self.status_code})>"
\ No newline at end of file
+        return f"<MonitoringResult(id={self.id}, url={self.url}, status={self.status_code})>"
+
+
+# Full-text index (FTS5) untuk search URL partial match
+# LIKE '%x%' ga bisa pake index biasa (full table scan), sedangkan FTS5 dengan
+# tokenizer trigram bisa nyari substring (min. 3 karakter) lewat inverted index.
+# content='monitoring_results': isinya ga disimpen dobel, cuma index-nya aja
+monitoring_results_fts = table(
+    "monitoring_results_fts",
+    column("rowid"),
+    column("url")
+)
+
+# DDL yang dijalanin waktu startup (lihat create_tables di main.py)
+# Trigger bikin index FTS selalu sinkron sama tabel monitoring_results
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS monitoring_results_fts USING fts5(
+        url, content='monitoring_results', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS monitoring_results_fts_ai
+    AFTER INSERT ON monitoring_results BEGIN
+        INSERT INTO monitoring_results_fts(rowid, url) VALUES (new.id, new.url);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS monitoring_results_fts_ad
+    AFTER DELETE ON monitoring_results BEGIN
+        INSERT INTO monitoring_results_fts(monitoring_results_fts, rowid, url)
+        VALUES ('delete', old.id, old.url);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS monitoring_results_fts_au
+    AFTER UPDATE OF url ON monitoring_results BEGIN
+        INSERT INTO monitoring_results_fts(monitoring_results_fts, rowid, url)
+        VALUES ('delete', old.id, old.url);
+        INSERT INTO monitoring_results_fts(rowid, url) VALUES (new.id, new.url);
+    END
+    """,
+]
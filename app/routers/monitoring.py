@@ -1,9 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.schemas.monitoring import MonitorRequest, MonitorResponse, PaginatedMonitorResponse
+from app.http_client import get_http_client
+from app.models.monitoring import MonitoringResult
+from app.schemas.monitoring import (
+    MonitorRequest,
+    MonitorResponse,
+    PaginatedMonitorResponse,
+    MonitoringStats,
+    BatchMonitorRequest,
+    BatchMonitorResponse,
+)
 from app.services.monitor_service import MonitorService
-from typing import List
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+import httpx
+import io
 import math
 
 
@@ -12,164 +26,242 @@ router = APIRouter(
     tags=["monitoring"]
 )
 
+# Serializer untuk /export/json (dibikin sekali, dipake ulang)
+_EXPORT_ADAPTER = TypeAdapter(List[MonitorResponse])
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Decode cursor dari query parameter, 400 kalau formatnya ga valid.
+    """
+    if cursor is None:
+        return None
+    try:
+        return MonitorService.decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @router.post("/monitor", response_model=MonitorResponse, status_code=201)
 async def monitor_url(
     request: MonitorRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_http_client)
 ):
     """
     Monitor sebuah URL dan simpan hasilnya.
-    
+
     Request body:
 ```json
     {
         "url": "https://google.com"
     }
 ```
-    
+
     Response:
     - 201: Monitoring berhasil
     - 422: Validation error (URL invalid)
     """
     # Service layer handle semua business logic
-    result = await MonitorService.monitor_and_save(db, request.url)
+    result = await MonitorService.monitor_and_save(db, client, request.url)
     return result
 
 
 @router.get("/results", response_model=PaginatedMonitorResponse)
 async def get_monitoring_results(
-    page: int = Query(1, ge=1, description="Halaman yang mau diambil (mulai dari 1)"),
+    cursor: Optional[str] = Query(None, description="Cursor dari response sebelumnya (kosong untuk halaman pertama)"),
     page_size: int = Query(10, ge=1, le=100, description="Jumlah item per halaman (max 100)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get semua monitoring results dengan pagination.
-    
+
     Query parameters:
-    - page: Halaman yang mau diambil (default: 1)
+    - cursor: `next_cursor` dari response sebelumnya (default: halaman pertama)
     - page_size: Jumlah item per halaman (default: 10, max: 100)
-    
+
     Response:
 ```json
     {
         "total": 100,
-        "page": 1,
         "page_size": 10,
         "total_pages": 10,
+        "next_cursor": "MTc2NzYwNzIwMDAwMHwyNQ==",
         "results": [...]
     }
 ```
     """
     # Get results dari service layer
-    results, total = MonitorService.get_all_results(db, page, page_size)
-    
+    results, total, next_cursor = await MonitorService.get_all_results(
+        db, page_size, _parse_cursor(cursor)
+    )
+
     # Hitung total pages
     # math.ceil buat bulatkan ke atas
     # Contoh: 25 items, page_size=10 -> 3 pages
     total_pages = math.ceil(total / page_size) if total > 0 else 0
-    
+
     return PaginatedMonitorResponse(
         total=total,
-        page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
         results=results
     )
 
 
-@router.get("/results/{result_id}", response_model=MonitorResponse)
-async def get_monitoring_result(
-    result_id: int,
-    db: Session = Depends(get_db)
-):
-    """
-    Get monitoring result by ID.
-    
-    Path parameter:
-    - result_id: ID monitoring result
-    
-    Response:
-    - 200: Result ditemukan
-    - 404: Result tidak ditemukan
-    """
-    result = MonitorService.get_result_by_id(db, result_id)
-    
-    if not result:
-        raise HTTPException(status_code=404, detail=f"Monitoring result with ID {result_id} not found")
-
-    @router.get("/results/filter/healthy", response_model=PaginatedMonitorResponse)
+@router.get("/results/filter/healthy", response_model=PaginatedMonitorResponse)
 async def get_healthy_results(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get hanya monitoring results yang HEALTHY.
     """
-    total = db.query(MonitoringResult).filter(MonitoringResult.is_healthy == True).count()
-    offset = (page - 1) * page_size
-    
-    results = (
-        db.query(MonitoringResult)
-        .filter(MonitoringResult.is_healthy == True)
-        .order_by(MonitoringResult.created_at.desc())
-        .limit(page_size)
-        .offset(offset)
-        .all()
+    results, total, next_cursor = await MonitorService.get_results_by_health(
+        db, True, page_size, _parse_cursor(cursor)
     )
-    
+
     total_pages = math.ceil(total / page_size) if total > 0 else 0
-    
+
     return PaginatedMonitorResponse(
         total=total,
-        page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
         results=results
     )
 
 
 @router.get("/results/filter/unhealthy", response_model=PaginatedMonitorResponse)
 async def get_unhealthy_results(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get hanya monitoring results yang UNHEALTHY.
     """
-    total = db.query(MonitoringResult).filter(MonitoringResult.is_healthy == False).count()
-    offset = (page - 1) * page_size
-    
-    results = (
-        db.query(MonitoringResult)
-        .filter(MonitoringResult.is_healthy == False)
-        .order_by(MonitoringResult.created_at.desc())
-        .limit(page_size)
-        .offset(offset)
-        .all()
+    results, total, next_cursor = await MonitorService.get_results_by_health(
+        db, False, page_size, _parse_cursor(cursor)
+    )
+
+    total_pages = math.ceil(total / page_size) if total > 0 else 0
+
+    return PaginatedMonitorResponse(
+        total=total,
+        page_size=page_size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        results=results
+    )
+
+
+# Route ini harus didaftarin sebelum /results/{result_id},
+# kalau ngga "search" bakal ketangkep sebagai result_id
+@router.get("/results/search", response_model=PaginatedMonitorResponse)
+async def search_results_by_url(
+    url: str = Query(..., description="URL untuk dicari (partial match)"),
+    cursor: Optional[str] = Query(None),
+    page_size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search monitoring results berdasarkan URL (partial match).
+
+    Example:
+    - url="google" akan match "https://www.google.com"
+
+    `total` di-cap ke page_size * 10; kalau kena batas,
+    `total_is_approximate` bernilai true.
+    """
+    # Hitungan total dibatasi biar search ga full scan cuma buat total
+    results, total, total_is_approximate, next_cursor = await MonitorService.search_results(
+        db, url, page_size, _parse_cursor(cursor)
     )
-    
+
     total_pages = math.ceil(total / page_size) if total > 0 else 0
-    
+
     return PaginatedMonitorResponse(
         total=total,
-        page=page,
+        total_is_approximate=total_is_approximate,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
         results=results
     )
 
-    from sqlalchemy import func
+
+@router.get("/results/{result_id}", response_model=MonitorResponse)
+async def get_monitoring_result(
+    result_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get monitoring result by ID.
+
+    Path parameter:
+    - result_id: ID monitoring result
+
+    Response:
+    - 200: Result ditemukan
+    - 404: Result tidak ditemukan
+    """
+    result = await MonitorService.get_result_by_id(db, result_id)
+
+    if not result:
+        raise HTTPException(status_code=404, detail=f"Monitoring result with ID {result_id} not found")
+
+    return result
+
+
+@router.delete("/results/{result_id}", status_code=204)
+async def delete_monitoring_result(
+    result_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete monitoring result by ID.
+
+    Response:
+    - 204: Successfully deleted
+    - 404: Result not found
+    """
+    result = await MonitorService.get_result_by_id(db, result_id)
+
+    if not result:
+        raise HTTPException(status_code=404, detail=f"Monitoring result with ID {result_id} not found")
+
+    await db.delete(result)
+    await db.commit()
+
+    MonitorService.invalidate_caches()
+
 
 @router.get("/stats", response_model=MonitoringStats)
-async def get_monitoring_stats(db: Session = Depends(get_db)):
+async def get_monitoring_stats(db: AsyncSession = Depends(get_db)):
     """
     Get statistik monitoring secara keseluruhan.
+
+    Hasilnya di-cache beberapa detik (lihat STATS_CACHE_TTL_SECONDS).
     """
-    total_checks = db.query(MonitoringResult).count()
-    
+    cached = MonitorService.get_cached_stats()
+    if cached is not None:
+        return cached
+
+    # Semua agregat dihitung dalam 1 query (1x table scan)
+    # avg/min/max di SQL otomatis skip NULL, jadi ga perlu filter isnot(None)
+    total_checks, healthy_count, avg_response, fastest, slowest = (await db.execute(
+        select(
+            func.count(MonitoringResult.id),
+            func.sum(case((MonitoringResult.is_healthy == True, 1), else_=0)),
+            func.avg(MonitoringResult.response_time_ms),
+            func.min(MonitoringResult.response_time_ms),
+            func.max(MonitoringResult.response_time_ms)
+        )
+    )).one()
+
     if total_checks == 0:
         return MonitoringStats(
             total_checks=0,
@@ -181,33 +273,20 @@ async def get_monitoring_stats(db: Session = Depends(get_db)):
             slowest_response_ms=None,
             most_monitored_url=None
         )
-    
-    healthy_count = db.query(MonitoringResult).filter(MonitoringResult.is_healthy == True).count()
+
     unhealthy_count = total_checks - healthy_count
     uptime_percentage = (healthy_count / total_checks) * 100
-    
-    # Average response time (exclude None values)
-    avg_response = db.query(func.avg(MonitoringResult.response_time_ms)).filter(
-        MonitoringResult.response_time_ms.isnot(None)
-    ).scalar()
-    
-    # Fastest response time
-    fastest = db.query(func.min(MonitoringResult.response_time_ms)).filter(
-        MonitoringResult.response_time_ms.isnot(None)
-    ).scalar()
-    
-    # Slowest response time
-    slowest = db.query(func.max(MonitoringResult.response_time_ms)).filter(
-        MonitoringResult.response_time_ms.isnot(None)
-    ).scalar()
-    
-    # Most monitored URL
-    most_monitored = db.query(
-        MonitoringResult.url,
-        func.count(MonitoringResult.url).label('count')
-    ).group_by(MonitoringResult.url).order_by(func.count(MonitoringResult.url).desc()).first()
-    
-    return MonitoringStats(
+
+    # Most monitored URL (bentuk query-nya beda, jadi tetap query terpisah;
+    # GROUP BY url bisa jalan di atas index ix_mr_url_created)
+    most_monitored = (await db.execute(
+        select(
+            MonitoringResult.url,
+            func.count(MonitoringResult.url).label('count')
+        ).group_by(MonitoringResult.url).order_by(func.count(MonitoringResult.url).desc()).limit(1)
+    )).first()
+
+    stats = MonitoringStats(
         total_checks=total_checks,
         healthy_count=healthy_count,
         unhealthy_count=unhealthy_count,
@@ -217,71 +296,20 @@ async def get_monitoring_stats(db: Session = Depends(get_db)):
         slowest_response_ms=round(slowest, 2) if slowest else None,
         most_monitored_url=most_monitored[0] if most_monitored else None
     )
-    @router.delete("/results/{result_id}", status_code=204)
-async def delete_monitoring_result(
-    result_id: int,
-    db: Session = Depends(get_db)
-):
-    """
-    Delete monitoring result by ID.
-    
-    Response:
-    - 204: Successfully deleted
-    - 404: Result not found
-    """
-    result = MonitorService.get_result_by_id(db, result_id)
-    
-    if not result:
-        raise HTTPException(status_code=404, detail=f"Monitoring result with ID {result_id} not found")
-    
-    db.delete(result)
-    db.commit()
 
-    @router.get("/results/search", response_model=PaginatedMonitorResponse)
-async def search_results_by_url(
-    url: str = Query(..., description="URL untuk dicari (partial match)"),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
-):
-    """
-    Search monitoring results berdasarkan URL (partial match).
-    
-    Example: 
-    - url="google" akan match "https://www.google.com"
-    """
-    total = db.query(MonitoringResult).filter(MonitoringResult.url.contains(url)).count()
-    offset = (page - 1) * page_size
-    
-    results = (
-        db.query(MonitoringResult)
-        .filter(MonitoringResult.url.contains(url))
-        .order_by(MonitoringResult.created_at.desc())
-        .limit(page_size)
-        .offset(offset)
-        .all()
-    )
-    
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
-    
-    return PaginatedMonitorResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        results=results
-    )
-    
-    import asyncio
+    MonitorService.cache_stats(stats)
+    return stats
+
 
 @router.post("/monitor/batch", response_model=BatchMonitorResponse, status_code=201)
 async def monitor_batch_urls(
     request: BatchMonitorRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_http_client)
 ):
     """
     Monitor multiple URLs sekaligus (max 10 URLs).
-    
+
     Request body:
 ```json
     {
@@ -293,51 +321,33 @@ async def monitor_batch_urls(
     }
 ```
     """
-    # Monitor semua URLs secara concurrent
-    tasks = [MonitorService.monitor_and_save(db, url) for url in request.urls]
-    results = await asyncio.gather(*tasks)
-    
+    # Monitor semua URLs secara concurrent, lalu simpan dalam 1 commit
+    results = await MonitorService.monitor_batch_and_save(db, client, request.urls)
+
     return BatchMonitorResponse(
         total_monitored=len(results),
         results=results
     )
 
-from fastapi.responses import StreamingResponse
-import json
-import io
 
 @router.get("/export/json")
-async def export_to_json(db: Session = Depends(get_db)):
+async def export_to_json(db: AsyncSession = Depends(get_db)):
     """
     Export semua monitoring results ke JSON file.
-    
+
     Response: JSON file download
     """
-    results = db.query(MonitoringResult).order_by(MonitoringResult.created_at.desc()).all()
-    
-    # Convert to dict
-    data = []
-    for result in results:
-        data.append({
-            "id": result.id,
-            "url": result.url,
-            "status_code": result.status_code,
-            "response_time_ms": result.response_time_ms,
-            "is_healthy": result.is_healthy,
-            "error_message": result.error_message,
-            "created_at": result.created_at.isoformat() if result.created_at else None
-        })
-    
-    # Create JSON string
-    json_str = json.dumps(data, indent=2)
-    
+    results = await MonitorService.get_results_for_export(db)
+
+    # Serialize langsung ke JSON bytes di pydantic-core (Rust),
+    # datetime di-encode native tanpa lewat json.dumps
+    json_bytes = _EXPORT_ADAPTER.dump_json(results, indent=2)
+
     # Create file-like object
-    json_io = io.BytesIO(json_str.encode('utf-8'))
-    
+    json_io = io.BytesIO(json_bytes)
+
     return StreamingResponse(
         json_io,
         media_type="application/json",
         headers={"Content-Disposition": "attachment; filename=monitoring_results.json"}
     )
-
-    return result
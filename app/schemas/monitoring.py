@@ -1,5 +1,5 @@
-from pydantic import BaseModel, HttpUrl, Field
-from datetime import datetime
+from pydantic import BaseModel, HttpUrl, Field, field_serializer
+from datetime import datetime, timezone
 from typing import Optional, List
 
 
@@ -37,7 +37,12 @@ class MonitorResponse(BaseModel):
     response_time_ms: Optional[float] = None
     is_healthy: bool
     error_message: Optional[str] = None
-    created_at: datetime
+    # Di DB disimpen sebagai epoch milliseconds, di JSON tetap ISO-8601 (UTC)
+    created_at: int
+
+    @field_serializer("created_at")
+    def serialize_created_at(self, created_at: int) -> datetime:
+        return datetime.fromtimestamp(created_at / 1000, tz=timezone.utc)
 
     class Config:
         # Biar bisa convert dari SQLAlchemy model
@@ -48,31 +53,37 @@ class PaginatedMonitorResponse(BaseModel):
     """
     Schema untuk response paginated.
     
+    Pagination pake keyset cursor, bukan nomor halaman.
+    
     Contains:
-    - total: total semua record di database
-    - page: halaman saat ini
+    - total: total semua record di database (optional)
+    - total_is_approximate: True kalau total cuma perkiraan (batas bawah)
     - page_size: jumlah item per halaman
-    - total_pages: total jumlah halaman
+    - total_pages: total jumlah halaman (optional)
+    - next_cursor: cursor untuk ambil halaman berikutnya (None kalau udah habis)
     - results: list monitoring results
     """
-    total: int = Field(..., description="Total semua monitoring results")
-    page: int = Field(..., description="Halaman saat ini")
+    total: Optional[int] = Field(None, description="Total semua monitoring results")
+    total_is_approximate: bool = Field(False, description="True kalau total cuma perkiraan (batas bawah)")
     page_size: int = Field(..., description="Jumlah item per halaman")
-    total_pages: int = Field(..., description="Total halaman")
+    total_pages: Optional[int] = Field(None, description="Total halaman")
+    next_cursor: Optional[str] = Field(None, description="Cursor untuk halaman berikutnya")
     results: List[MonitorResponse] = Field(..., description="List monitoring results")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "total": 100,
-                "page": 1,
+                "total_is_approximate": False,
                 "page_size": 10,
                 "total_pages": 10,
+                "next_cursor": "MTc2NzYwNzIwMDAwMHwyNQ==",
                 "results": []
             }
         }
 
-    class MonitoringStats(BaseModel):
+
+class MonitoringStats(BaseModel):
     """
     Schema untuk statistik monitoring.
     """
@@ -85,7 +96,8 @@ class PaginatedMonitorResponse(BaseModel):
     slowest_response_ms: Optional[float]
     most_monitored_url: Optional[str]
 
-    class BatchMonitorRequest(BaseModel):
+
+class BatchMonitorRequest(BaseModel):
     """
     Schema untuk batch monitoring.
     """
@@ -1,11 +1,95 @@
+import asyncio
 import httpx
 import time
-from sqlalchemy.orm import Session
-from app.models.monitoring import MonitoringResult
+import base64
+import weakref
+from cachetools import TTLCache
+from sqlalchemy import Select, bindparam, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.monitoring import MonitoringResult, monitoring_results_fts
+from app.schemas.monitoring import MonitorResponse, MonitoringStats
 from typing import Optional, Tuple
+from urllib.parse import urlparse
 import math
 
 
+# Cache hasil /stats per-process: (waktu dihitung, hasil)
+# Dashboard yang polling tiap beberapa detik ga perlu scan tabel tiap kali
+# Kalau deploy multi-process, ganti ke Redis dengan key yang sama
+STATS_CACHE_TTL_SECONDS = 5.0
+_stats_cache: Optional[Tuple[float, MonitoringStats]] = None
+
+# Cache COUNT(*) untuk pagination, key-nya string predicate filter
+# COUNT(*) itu O(N) walaupun ada index, jadi ga dihitung ulang tiap halaman
+COUNT_CACHE_TTL_SECONDS = 5.0
+_count_cache: TTLCache = TTLCache(maxsize=32, ttl=COUNT_CACHE_TTL_SECONDS)
+
+# Maksimal check yang jalan barengan dalam 1 batch
+BATCH_CONCURRENCY = 10
+
+# Status code HEAD yang bikin check_url fallback ke GET
+# (banyak server/framework ga nge-handle method HEAD)
+HEAD_FALLBACK_STATUS_CODES = {404, 405, 501}
+
+# Maksimal check yang jalan barengan ke 1 host yang sama
+# Biar burst request ke host yang sama ga nge-hammer (dan kena rate limit)
+# Weak reference: semaphore host yang lagi ga dipake otomatis kebuang,
+# jadi registry-nya ga numpuk terus sama host dari URL user. Semaphore yang
+# idle pasti lagi penuh, jadi bikin ulang nanti hasilnya sama aja
+PER_HOST_CONCURRENCY = 4
+_host_semaphores: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+
+# /results/search ngitung total maksimal page_size * N row
+SEARCH_COUNT_LIMIT_PAGES = 10
+
+# Statement yang sering dipake dibikin sekali di sini (pake bindparam),
+# ga dibangun ulang tiap request. Nilainya dikirim waktu execute.
+_BY_ID = select(MonitoringResult).where(MonitoringResult.id == bindparam("id"))
+
+# List endpoint cuma butuh kolom-kolom MonitorResponse, jadi select kolom
+# tabelnya langsung (Core, bukan ORM): ga ada ORM object, identity map, dll.
+# Hasilnya dibaca pake .mappings() lalu bikin response pake model_construct
+_results_table = MonitoringResult.__table__
+_RESULT_COLUMNS = (
+    _results_table.c.id,
+    _results_table.c.url,
+    _results_table.c.status_code,
+    _results_table.c.response_time_ms,
+    _results_table.c.is_healthy,
+    _results_table.c.error_message,
+    _results_table.c.created_at,
+)
+_ALL_RESULTS = select(*_RESULT_COLUMNS)
+_HEALTHY_RESULTS = select(*_RESULT_COLUMNS).where(_results_table.c.is_healthy == True)
+_UNHEALTHY_RESULTS = select(*_RESULT_COLUMNS).where(_results_table.c.is_healthy == False)
+
+# Search URL pake index FTS5 trigram (lihat models/monitoring.py)
+# Trigram butuh minimal 3 karakter, yang lebih pendek fallback ke LIKE
+FTS_MIN_QUERY_LENGTH = 3
+_SEARCH_RESULTS = select(*_RESULT_COLUMNS).where(
+    _results_table.c.id.in_(
+        select(monitoring_results_fts.c.rowid)
+        .where(monitoring_results_fts.c.url.match(bindparam("url")))
+    )
+)
+_SEARCH_RESULTS_LIKE = select(*_RESULT_COLUMNS).where(
+    _results_table.c.url.contains(bindparam("url"))
+)
+
+# Keyset: row setelah cursor (created_at, id), urut dari yang terbaru
+# Pake row value (created_at, id) < (:ts, :id), bukan bentuk OR-nya:
+# SQLite cuma bisa pake row value sebagai range di index (created_at<?),
+# bentuk OR bikin index di-scan dari row terbaru sampai ketemu cursor
+_AFTER_CURSOR = tuple_(_results_table.c.created_at, _results_table.c.id) < tuple_(
+    bindparam("cursor_ts"), bindparam("cursor_id")
+)
+_NEWEST_FIRST = (_results_table.c.created_at.desc(), _results_table.c.id.desc())
+
+# Range nilai cursor yang valid (SQLite INTEGER = signed 64-bit)
+_SQLITE_INT_MIN = -(2 ** 63)
+_SQLITE_INT_MAX = 2 ** 63 - 1
+
+
 class MonitorService:
     """
     Service class untuk handle monitoring logic.
@@ -17,48 +101,111 @@ class MonitorService:
     """
     
     @staticmethod
-    async def check_url(url: str) -> Tuple[Optional[int], Optional[float], Optional[str]]:
+    async def check_url(
+        client: httpx.AsyncClient,
+        url: str
+    ) -> Tuple[Optional[int], Optional[float], Optional[str]]:
         """
         Check URL dan return (status_code, response_time_ms, error_message).
         
+        Pake HEAD dulu (tanpa download body), fallback ke GET streaming kalau
+        servernya ga support HEAD. Response time diukur sampai header diterima.
+        
         Menggunakan httpx AsyncClient untuk fully async operation.
+        Client-nya shared (dibikin sekali di lifespan), jadi koneksi ke host
+        yang sama bisa dipake ulang antar check.
+        Check ke host yang sama dibatasi PER_HOST_CONCURRENCY sekaligus.
         
         Args:
+            client: Shared httpx AsyncClient
             url: URL yang mau di-check
             
         Returns:
             Tuple of (status_code, response_time_ms, error_message)
         """
-        # httpx.AsyncClient untuk async HTTP requests
-        # timeout 10 detik biar ga nunggu kelamaan
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                # Mulai timer
+        try:
+            async with MonitorService.host_semaphore(url):
+                # Mulai timer (setelah dapet giliran, waktu antri ga diitung)
                 start_time = time.perf_counter()
                 
-                # Kirim GET request (async)
-                # follow_redirects=True untuk follow redirect (301, 302)
-                response = await client.get(url, follow_redirects=True)
-                
-                # Stop timer
+                # Kirim HEAD request (async): cuma butuh status code, ga perlu body
+                # Redirect (301, 302) di-follow, udah di-set di client
+                response = await client.head(url)
                 end_time = time.perf_counter()
                 
-                # Hitung response time dalam milliseconds
-                response_time_ms = (end_time - start_time) * 1000
-                
-                return response.status_code, response_time_ms, None
-                
-            except httpx.TimeoutException:
-                # Request timeout (> 10 detik)
-                return None, None, "Request timeout (> 10 seconds)"
-                
-            except httpx.RequestError as e:
-                # Network error, DNS error, connection refused, etc
-                return None, None, f"Request error: {str(e)}"
-                
-            except Exception as e:
-                # Catch-all untuk error lainnya
-                return None, None, f"Unexpected error: {str(e)}"
+                if response.status_code in HEAD_FALLBACK_STATUS_CODES:
+                    # Server ga support HEAD: fallback ke GET streaming.
+                    # Timer berhenti begitu header diterima, dan body-nya
+                    # ga pernah dibaca (dibuang waktu keluar dari `async with`)
+                    start_time = time.perf_counter()
+                    async with client.stream("GET", url) as response:
+                        end_time = time.perf_counter()
+            
+            # Hitung response time dalam milliseconds
+            response_time_ms = (end_time - start_time) * 1000
+            
+            return response.status_code, response_time_ms, None
+            
+        except httpx.TimeoutException:
+            # Request timeout (> 10 detik)
+            return None, None, "Request timeout (> 10 seconds)"
+            
+        except httpx.RequestError as e:
+            # Network error, DNS error, connection refused, etc
+            return None, None, f"Request error: {str(e)}"
+            
+        except Exception as e:
+            # Catch-all untuk error lainnya
+            return None, None, f"Unexpected error: {str(e)}"
+    
+    @staticmethod
+    def host_semaphore(url: str) -> asyncio.Semaphore:
+        """
+        Ambil (atau bikin) semaphore untuk host dari URL.
+        
+        Args:
+            url: URL yang mau di-check
+            
+        Returns:
+            asyncio.Semaphore yang dipake bareng semua check ke host itu
+        """
+        host = urlparse(url).netloc
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = _host_semaphores[host] = asyncio.Semaphore(PER_HOST_CONCURRENCY)
+        return semaphore
+    
+    @staticmethod
+    def get_cached_stats() -> Optional[MonitoringStats]:
+        """
+        Ambil MonitoringStats dari cache kalau belum expired.
+        
+        Returns:
+            MonitoringStats atau None kalau cache kosong/expired
+        """
+        if _stats_cache is None:
+            return None
+        cached_at, stats = _stats_cache
+        if time.monotonic() - cached_at >= STATS_CACHE_TTL_SECONDS:
+            return None
+        return stats
+    
+    @staticmethod
+    def cache_stats(stats: MonitoringStats) -> None:
+        """
+        Simpan MonitoringStats yang baru dihitung ke cache.
+        """
+        global _stats_cache
+        _stats_cache = (time.monotonic(), stats)
+    
+    @staticmethod
+    def invalidate_caches() -> None:
+        """
+        Kosongkan cache stats & count. Dipanggil setiap ada data yang ditambah/dihapus.
+        """
+        global _stats_cache
+        _stats_cache = None
+        _count_cache.clear()
     
     @staticmethod
     def is_healthy(status_code: Optional[int]) -> bool:
@@ -76,82 +223,369 @@ class MonitorService:
         Returns:
             True jika healthy, False jika unhealthy
         """
-        if status_code is None:
-            return False
-        return 200 <= status_code < 400
+        return status_code is not None and 200 <= status_code < 400
     
     @staticmethod
-    async def monitor_and_save(db: Session, url: str) -> MonitoringResult:
+    async def monitor_and_save(
+        db: AsyncSession,
+        client: httpx.AsyncClient,
+        url: str
+    ) -> MonitoringResult:
         """
         Monitor URL dan simpan hasilnya ke database.
         
         Args:
             db: Database session
+            client: Shared httpx AsyncClient
             url: URL yang mau dimonitor
             
         Returns:
             MonitoringResult object yang sudah disimpan
         """
+        # Convert HttpUrl to string (httpx & SQLite butuh str)
+        url = str(url)
+        
         # Check URL (async operation)
-        status_code, response_time_ms, error_message = await MonitorService.check_url(url)
+        status_code, response_time_ms, error_message = await MonitorService.check_url(client, url)
         
         # Tentukan health status
         is_healthy = MonitorService.is_healthy(status_code)
         
-        # Bikin monitoring result object
-        result = MonitoringResult(
-            url=str(url),  # Convert HttpUrl to string
-            status_code=status_code,
-            response_time_ms=response_time_ms,
-            is_healthy=is_healthy,
-            error_message=error_message
-        )
+        # Save ke database pake INSERT ... RETURNING
+        # ID & created_at langsung balik dari INSERT, ga perlu SELECT lagi (refresh)
+        # await: query jalan di thread aiosqlite, event loop tetap bebas
+        result = (await db.execute(
+            insert(MonitoringResult)
+            .values(
+                url=url,
+                status_code=status_code,
+                response_time_ms=response_time_ms,
+                is_healthy=is_healthy,
+                error_message=error_message
+            )
+            .returning(MonitoringResult)
+        )).scalar_one()
+        await db.commit()
         
-        # Save ke database
-        db.add(result)
-        db.commit()
-        db.refresh(result)  # Refresh biar dapet ID yang auto-generated
+        # Data berubah, stats yang di-cache udah ga valid
+        MonitorService.invalidate_caches()
         
         return result
     
     @staticmethod
-    def get_all_results(
-        db: Session, 
-        page: int = 1, 
-        page_size: int = 10
-    ) -> Tuple[list[MonitoringResult], int]:
+    async def monitor_batch_and_save(
+        db: AsyncSession,
+        client: httpx.AsyncClient,
+        urls: list[str]
+    ) -> list[MonitoringResult]:
+        """
+        Monitor banyak URL secara concurrent, lalu simpan semuanya sekaligus.
+        
+        Check-nya jalan paralel (asyncio.TaskGroup), jadi total waktu kira-kira
+        sama dengan URL yang paling lambat, bukan jumlah semuanya.
+        Hasilnya di-insert dalam 1 transaksi (1x commit, bukan N kali).
+        
+        Args:
+            db: Database session
+            client: Shared httpx AsyncClient
+            urls: List URL yang mau dimonitor
+            
+        Returns:
+            List MonitoringResult yang sudah disimpan (urutannya sama dengan urls)
+        """
+        urls = [str(url) for url in urls]
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def check(url: str):
+            async with semaphore:
+                return await MonitorService.check_url(client, url)
+        
+        # TaskGroup: kalau ada 1 task yang error, sisanya otomatis di-cancel
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(check(url)) for url in urls]
+        checks = [task.result() for task in tasks]
+        
+        rows = [
+            {
+                "url": url,
+                "status_code": status_code,
+                "response_time_ms": response_time_ms,
+                "is_healthy": MonitorService.is_healthy(status_code),
+                "error_message": error_message,
+            }
+            for url, (status_code, response_time_ms, error_message) in zip(urls, checks)
+        ]
+        
+        # INSERT ... RETURNING: ID & created_at langsung dapet tanpa SELECT per row.
+        # Urutan RETURNING ga dijamin SQLite, sort_by_parameter_order bikin
+        # SQLAlchemy balikin hasilnya sesuai urutan rows (di SQLite caranya
+        # 1 INSERT per row, tapi tetap dalam 1 transaksi; batch max 10 URL)
+        results = (await db.scalars(
+            insert(MonitoringResult).returning(MonitoringResult, sort_by_parameter_order=True),
+            rows
+        )).all()
+        await db.commit()
+        
+        MonitorService.invalidate_caches()
+        
+        return results
+    
+    @staticmethod
+    def encode_cursor(result: MonitorResponse) -> str:
+        """
+        Encode posisi row terakhir jadi cursor opaque (base64) untuk API.
+        
+        Args:
+            result: Row terakhir di halaman saat ini
+            
+        Returns:
+            String cursor, contoh: "MTc2NzYwNzIwMDAwMHwyNQ=="
+        """
+        raw = f"{result.created_at}|{result.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[int, int]:
+        """
+        Decode cursor dari API jadi (created_at, id).
+        
+        Args:
+            cursor: String cursor hasil encode_cursor
+            
+        Returns:
+            Tuple of (created_at epoch ms, id)
+            
+        Raises:
+            ValueError: Kalau cursor ga valid
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, result_id = raw.rsplit("|", 1)
+            created_at, result_id = int(created_at), int(result_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        # Di luar range ini sqlite3 gagal bind (OverflowError -> 500), jadi tolak di sini
+        if not all(_SQLITE_INT_MIN <= value <= _SQLITE_INT_MAX for value in (created_at, result_id)):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return created_at, result_id
+    
+    @staticmethod
+    async def count(
+        db: AsyncSession,
+        stmt: Select,
+        cache_key: str,
+        params: Optional[dict] = None
+    ) -> int:
+        """
+        Hitung jumlah row hasil sebuah select (tanpa LIMIT), pake cache.
+        
+        Args:
+            db: Database session
+            stmt: select(*_RESULT_COLUMNS) (boleh udah di-filter)
+            cache_key: String yang mewakili filter di stmt, contoh "is_healthy=True"
+            params: Nilai bindparam di stmt
+            
+        Returns:
+            Jumlah row
+        """
+        total = _count_cache.get(cache_key)
+        if total is None:
+            conn = await db.connection()
+            total = await conn.scalar(
+                select(func.count()).select_from(stmt.subquery()), params
+            )
+            _count_cache[cache_key] = total
+        return total
+    
+    @staticmethod
+    async def count_bounded(
+        db: AsyncSession,
+        stmt: Select,
+        limit: int,
+        params: Optional[dict] = None
+    ) -> Tuple[int, bool]:
         """
-        Get semua monitoring results dengan pagination.
+        Hitung jumlah row, tapi berhenti setelah `limit` row.
+        
+        Dipake untuk filter yang ga bisa di-cache (misalnya search bebas),
+        biar kerjaannya ga pernah lebih dari `limit` + 1 row. Row ekstra-nya
+        buat bedain "pas `limit` row" dari "lebih dari `limit` row".
         
         Args:
             db: Database session
-            page: Halaman yang mau diambil (mulai dari 1)
+            stmt: select(*_RESULT_COLUMNS) (boleh udah di-filter)
+            limit: Batas maksimal row yang dihitung
+            params: Nilai bindparam di stmt
+            
+        Returns:
+            Tuple of (total, is_approximate). is_approximate True kalau
+            hitungannya kepotong di `limit` (total asli bisa lebih banyak)
+        """
+        conn = await db.connection()
+        total = await conn.scalar(
+            select(func.count()).select_from(stmt.limit(limit + 1).subquery()), params
+        )
+        return min(total, limit), total > limit
+    
+    @staticmethod
+    async def paginate(
+        db: AsyncSession,
+        stmt: Select,
+        page_size: int = 10,
+        cursor: Optional[Tuple[int, int]] = None,
+        params: Optional[dict] = None
+    ) -> Tuple[list[MonitorResponse], Optional[str]]:
+        """
+        Keyset (seek) pagination di atas query MonitoringResult.
+        
+        Beda sama offset pagination, di sini DB ga perlu baca lalu buang
+        `offset` row tiap halaman. Row dicari langsung lewat index
+        (created_at, id), jadi halaman ke-1000 sama cepetnya kayak halaman 1.
+        
+        Args:
+            db: Database session
+            stmt: select(*_RESULT_COLUMNS) (boleh udah di-filter)
             page_size: Jumlah item per halaman
+            cursor: (created_at, id) row terakhir halaman sebelumnya
+            params: Nilai bindparam di stmt
             
         Returns:
-            Tuple of (results, total_count)
+            Tuple of (results, next_cursor). next_cursor None kalau udah habis.
         """
-        # Hitung total records
-        total = db.query(MonitoringResult).count()
+        params = dict(params or {})
+        if cursor is not None:
+            stmt = stmt.where(_AFTER_CURSOR)
+            params["cursor_ts"], params["cursor_id"] = cursor
+        
+        # Ambil 1 row ekstra buat ngecek masih ada halaman berikutnya atau ngga
+        # Dieksekusi langsung di Core connection, bypass ORM session
+        conn = await db.connection()
+        rows = (await conn.execute(
+            stmt.order_by(*_NEWEST_FIRST).limit(page_size + 1), params
+        )).mappings().all()
+        
+        # Data dari DB udah pasti tipenya bener, jadi skip validasi Pydantic
+        results = [MonitorResponse.model_construct(**row) for row in rows]
         
-        # Hitung offset untuk pagination
-        # Contoh: page=2, page_size=10 -> offset=10 (skip 10 items)
-        offset = (page - 1) * page_size
+        next_cursor = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            next_cursor = MonitorService.encode_cursor(results[-1])
+        
+        return results, next_cursor
+    
+    @staticmethod
+    async def get_all_results(
+        db: AsyncSession,
+        page_size: int = 10,
+        cursor: Optional[Tuple[int, int]] = None
+    ) -> Tuple[list[MonitorResponse], int, Optional[str]]:
+        """
+        Get semua monitoring results dengan keyset pagination.
+        
+        Args:
+            db: Database session
+            page_size: Jumlah item per halaman
+            cursor: (created_at, id) row terakhir halaman sebelumnya,
+                None untuk halaman pertama
+            
+        Returns:
+            Tuple of (results, total_count, next_cursor)
+        """
+        # Hitung total records
+        total = await MonitorService.count(db, _ALL_RESULTS, "all")
         
-        # Query dengan limit & offset
         # order_by desc biar yang terbaru muncul duluan
-        results = (
-            db.query(MonitoringResult)
-            .order_by(MonitoringResult.created_at.desc())
-            .limit(page_size)
-            .offset(offset)
-            .all()
+        results, next_cursor = await MonitorService.paginate(
+            db, _ALL_RESULTS, page_size, cursor
+        )
+        
+        return results, total, next_cursor
+    
+    @staticmethod
+    async def get_results_by_health(
+        db: AsyncSession,
+        is_healthy: bool,
+        page_size: int = 10,
+        cursor: Optional[Tuple[int, int]] = None
+    ) -> Tuple[list[MonitorResponse], int, Optional[str]]:
+        """
+        Get monitoring results yang healthy / unhealthy aja.
+        
+        Args:
+            db: Database session
+            is_healthy: True untuk yang healthy, False untuk yang unhealthy
+            page_size: Jumlah item per halaman
+            cursor: (created_at, id) row terakhir halaman sebelumnya
+            
+        Returns:
+            Tuple of (results, total_count, next_cursor)
+        """
+        stmt = _HEALTHY_RESULTS if is_healthy else _UNHEALTHY_RESULTS
+        total = await MonitorService.count(db, stmt, f"is_healthy={is_healthy}")
+        
+        results, next_cursor = await MonitorService.paginate(db, stmt, page_size, cursor)
+        
+        return results, total, next_cursor
+    
+    @staticmethod
+    async def search_results(
+        db: AsyncSession,
+        url: str,
+        page_size: int = 10,
+        cursor: Optional[Tuple[int, int]] = None
+    ) -> Tuple[list[MonitorResponse], int, bool, Optional[str]]:
+        """
+        Search monitoring results berdasarkan URL (partial match).
+        
+        Pake index FTS5 trigram, jadi ga full table scan kayak LIKE '%x%'.
+        Total-nya dihitung maksimal page_size * SEARCH_COUNT_LIMIT_PAGES row.
+        
+        Args:
+            db: Database session
+            url: Potongan URL yang dicari
+            page_size: Jumlah item per halaman
+            cursor: (created_at, id) row terakhir halaman sebelumnya
+            
+        Returns:
+            Tuple of (results, total_count, total_is_approximate, next_cursor)
+        """
+        if len(url) >= FTS_MIN_QUERY_LENGTH:
+            # Dibungkus tanda kutip biar dianggap 1 frasa (substring),
+            # bukan sintaks query FTS5 (AND, OR, *, dll)
+            stmt = _SEARCH_RESULTS
+            params = {"url": '"' + url.replace('"', '""') + '"'}
+        else:
+            stmt = _SEARCH_RESULTS_LIKE
+            params = {"url": url}
+        
+        total, total_is_approximate = await MonitorService.count_bounded(
+            db, stmt, page_size * SEARCH_COUNT_LIMIT_PAGES, params
+        )
+        
+        results, next_cursor = await MonitorService.paginate(
+            db, stmt, page_size, cursor, params
         )
         
-        return results, total
+        return results, total, total_is_approximate, next_cursor
+    
+    @staticmethod
+    async def get_results_for_export(db: AsyncSession) -> list[MonitorResponse]:
+        """
+        Get semua monitoring results (terbaru duluan) untuk di-export.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            List MonitorResponse
+        """
+        conn = await db.connection()
+        rows = (await conn.execute(_ALL_RESULTS.order_by(*_NEWEST_FIRST))).mappings().all()
+        return [MonitorResponse.model_construct(**row) for row in rows]
     
     @staticmethod
-    def get_result_by_id(db: Session, result_id: int) -> Optional[MonitoringResult]:
+    async def get_result_by_id(db: AsyncSession, result_id: int) -> Optional[MonitoringResult]:
         """
         Get monitoring result by ID.
         
@@ -162,4 +596,4 @@ class MonitorService:
         Returns:
             MonitoringResult object atau None kalau ga ketemu
         """
-        return db.query(MonitoringResult).filter(MonitoringResult.id == result_id).first()
\ No newline at end of file
+        return (await db.execute(_BY_ID, {"id": result_id})).scalar_one_or_none()